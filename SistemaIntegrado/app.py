@@ -12,12 +12,14 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import os
-import shutil
+import tempfile
 import altair as alt
 
-from data_converters.convert_dat2csv import convert_dat_to_csv
-from data_converters.convert_tdms2csv import convert_tdms_to_csv
-from data_converters.procesar_archivos import clean_data_csv, clean_dynamic_data
+from data_converters.pipeline import process_file, STATIC_SUBDIR, DYNAMIC_SUBDIR
+from data_converters.calidad_datos import load_cal_limits_from_dir, read_quality_summary
+from data_converters.exportar_datos import export_selection, EXPORT_FORMATS
+from data_converters.alertas import AlertEngine, CsvTailReader, rules_from_cal_limits
+from data_converters.comparar_corridas import compare_runs, repeatability_summary
 
 
 # ============================================================================
@@ -33,13 +35,20 @@ st.set_page_config(
 # Rutas de directorios
 DATA_DIR = "datos"
 PROCESSED_DIR = "archivos_procesados"
-STATIC_DIR = os.path.join(PROCESSED_DIR, "Pruebas_Estaticas")
-DYNAMIC_DIR = os.path.join(PROCESSED_DIR, "Pruebas_Dinamicas")
+STATIC_DIR = os.path.join(PROCESSED_DIR, STATIC_SUBDIR)
+DYNAMIC_DIR = os.path.join(PROCESSED_DIR, DYNAMIC_SUBDIR)
+EXPORT_DIR = os.path.join(PROCESSED_DIR, "Exportaciones")
 
 # Crear directorios si no existen
-for directory in [PROCESSED_DIR, STATIC_DIR, DYNAMIC_DIR]:
+for directory in [PROCESSED_DIR, STATIC_DIR, DYNAMIC_DIR, EXPORT_DIR]:
     os.makedirs(directory, exist_ok=True)
 
+# Copy-on-Write: las selecciones sobre el dataset compartido son vistas y
+# cualquier escritura crea una copia local en lugar de modificar el original
+# (siempre activo a partir de pandas 3.0)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
 
 # ============================================================================
 # FUNCIONES DE PROCESAMIENTO
@@ -49,6 +58,9 @@ def run_conversion_and_cleaning():
     """
     Convierte y limpia todos los archivos .dat, .tdms y .csv en DATA_DIR
     
+    Usa el mismo flujo por archivo (process_file) que la línea de comandos
+    de main.py, por lo que ambas generan salidas idénticas.
+    
     Returns:
         tuple: (cantidad_procesada, mensaje_estado)
     """
@@ -59,76 +71,35 @@ def run_conversion_and_cleaning():
     
     st.toast("Iniciando procesamiento de archivos...", icon="⏳")
     processed_count = 0
+    cal_limits = load_cal_limits_from_dir(DATA_DIR)
     
     for filename in files:
-        input_path = os.path.join(DATA_DIR, filename)
-        base_name = os.path.splitext(filename)[0]
-        
-        # Determinar tipo de archivo y carpeta destino
-        target_dir, is_static = _get_target_directory(filename)
-        
-        if target_dir is None:
-            continue  # Archivo no soportado
-        
-        # Convertir archivo al formato CSV
-        original_csv = os.path.join(target_dir, f"{base_name}_original.csv")
-        _convert_file(filename, input_path, original_csv, target_dir)
+        result = process_file(os.path.join(DATA_DIR, filename), STATIC_DIR, DYNAMIC_DIR, cal_limits)
         
-        # Limpiar y normalizar el CSV
-        if os.path.exists(original_csv):
-            modified_csv = os.path.join(target_dir, f"{base_name}_modificado.csv")
-            
-            try:
-                if is_static:
-                    clean_data_csv(original_csv, modified_csv, is_static)
-                else:
-                    clean_dynamic_data(original_csv, modified_csv)
-                
-                processed_count += 1
-                st.toast(f"✅ Procesado: {filename}")
-                
-            except Exception as e:
-                st.error(f"Error en limpieza de {filename}: {e}")
+        if result['estado'] == 'ok':
+            processed_count += 1
+            st.toast(f"✅ Procesado: {filename}")
+        elif result['estado'] == 'error':
+            st.error(f"Error en limpieza de {filename}: {result['error']}")
     
     return processed_count, "¡Proceso completado!"
 
 
-def _get_target_directory(filename):
-    """
-    Determina el directorio destino según la extensión del archivo
-    
-    Returns:
-        tuple: (directorio_destino, es_estatico)
-    """
-    if filename.endswith('.dat') or filename.endswith('.csv'):
-        return STATIC_DIR, True
-    elif filename.endswith('.tdms'):
-        return DYNAMIC_DIR, False
-    return None, None
-
-
-def _convert_file(filename, input_path, output_path, target_dir):
-    """Convierte archivos .dat, .tdms o .csv a formato CSV normalizado"""
-    os.makedirs(target_dir, exist_ok=True)
-    
-    if filename.endswith('.dat'):
-        convert_dat_to_csv(input_path, output_path)
-    elif filename.endswith('.tdms'):
-        convert_tdms_to_csv(input_path, output_path)
-    elif filename.endswith('.csv'):
-        shutil.copy(input_path, output_path)
-
-
-@st.cache_data(show_spinner="Cargando datos procesados...")
+@st.cache_resource(show_spinner="Cargando datos procesados...")
 def load_processed_data(folder_list):
     """
     Carga y unifica todos los archivos _modificado.csv de las carpetas especificadas
     
+    El resultado se guarda una sola vez por proceso del servidor y se comparte
+    entre todas las sesiones, por lo que no debe modificarse. Las filas quedan
+    ordenadas por archivo y RECORD para que cada archivo ocupe un bloque
+    contiguo y las selecciones puedan hacerse con rebanadas (vistas).
+    
     Args:
-        folder_list: Lista de rutas de carpetas a procesar
+        folder_list: Tupla de rutas de carpetas a procesar
         
     Returns:
-        DataFrame unificado con todos los datos procesados
+        tuple: (DataFrame unificado, índice {archivo: metadatos del bloque})
     """
     all_dfs = []
     
@@ -141,19 +112,122 @@ def load_processed_data(folder_list):
                     if df is not None:
                         all_dfs.append(df)
     
-    return pd.concat(all_dfs, ignore_index=True) if all_dfs else pd.DataFrame()
+    if not all_dfs:
+        return pd.DataFrame(), {}
+    
+    all_data = pd.concat(all_dfs, ignore_index=True)
+    
+    if 'RECORD' not in all_data.columns:
+        return all_data, {}
+    
+    all_data = all_data.dropna(subset=['RECORD'])
+    all_data = all_data.sort_values(['Origen_Archivo', 'RECORD'], kind='mergesort', ignore_index=True)
+    all_data['Origen_Archivo'] = all_data['Origen_Archivo'].astype('category')
+    all_data['Tipo_Prueba'] = all_data['Tipo_Prueba'].astype('category')
+    
+    return all_data, _build_file_index(all_data)
+
+
+def _build_file_index(all_data):
+    """
+    Registra el bloque de filas, el tipo de prueba y las columnas con datos de cada archivo
+    
+    Returns:
+        dict: {archivo: {'tipo', 'inicio', 'fin', 'columnas'}}
+    """
+    file_index = {}
+    origins = all_data['Origen_Archivo'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, origins[1:] != origins[:-1]])
+    stops = np.r_[starts[1:], len(all_data)]
+    
+    for start, stop in zip(starts, stops):
+        block = all_data.iloc[start:stop]
+        file_index[origins[start]] = {
+            'tipo': block['Tipo_Prueba'].iloc[0],
+            'inicio': int(start),
+            'fin': int(stop),
+            'columnas': block.columns[block.notna().any()].tolist(),
+        }
+    
+    return file_index
+
+
+def select_data(all_data, file_index, origins, test_type, record_range=None):
+    """
+    Selecciona las filas de los archivos y rango de RECORD indicados
+    
+    Cuando la selección es un único bloque contiguo se devuelve una vista del
+    dataset compartido. En otro caso solo se copian las columnas que tienen
+    datos en los archivos seleccionados.
+    
+    Args:
+        all_data: DataFrame compartido devuelto por load_processed_data
+        file_index: Índice de bloques por archivo
+        origins: Archivos seleccionados
+        test_type: 'Estática' o 'Dinámica'
+        record_range: Tupla (min, max) de RECORD o None
+        
+    Returns:
+        DataFrame con la selección (vacío si no hay datos)
+    """
+    records = all_data['RECORD'].to_numpy() if 'RECORD' in all_data.columns else None
+    ranges = []
+    columns = []
+    
+    for origin in origins:
+        info = file_index.get(origin)
+        if info is None or info['tipo'] != test_type:
+            continue
+        
+        start, stop = info['inicio'], info['fin']
+        if record_range is not None:
+            block = records[start:stop]
+            stop = start + int(np.searchsorted(block, record_range[1], side='right'))
+            start = start + int(np.searchsorted(block, record_range[0], side='left'))
+        
+        if start < stop:
+            ranges.append((start, stop))
+            columns += [col for col in info['columnas'] if col not in columns]
+    
+    if not ranges:
+        return all_data.iloc[0:0]
+    
+    columns = [col for col in all_data.columns if col in columns]
+    
+    # Unir bloques adyacentes
+    ranges.sort()
+    merged = [ranges[0]]
+    for start, stop in ranges[1:]:
+        if start == merged[-1][1]:
+            merged[-1] = (merged[-1][0], stop)
+        else:
+            merged.append((start, stop))
+    
+    if len(merged) == 1:
+        return all_data[columns].iloc[merged[0][0]:merged[0][1]]
+    
+    positions = np.concatenate([np.arange(start, stop) for start, stop in merged])
+    return all_data[columns].iloc[positions]
+
+
+def _origin_key(filepath):
+    """Identificador único de un archivo procesado: su ruta relativa a PROCESSED_DIR"""
+    return os.path.relpath(filepath, PROCESSED_DIR).replace(os.sep, '/')
 
 
 def _load_single_csv(filepath, filename, root):
     """
     Carga un archivo CSV individual y agrega metadatos
     
+    Origen_Archivo es la ruta relativa a PROCESSED_DIR, para que archivos con
+    el mismo nombre en distintas subcarpetas se identifiquen por separado.
+    
     Returns:
         DataFrame procesado o None si hay error
     """
     try:
         df = pd.read_csv(filepath)
-        df['Origen_Archivo'] = filename
+        df['Origen_Archivo'] = _origin_key(filepath)
         
         # Clasificar tipo de prueba según la carpeta
         if STATIC_DIR in root:
@@ -199,10 +273,78 @@ def _normalize_timestamp(df, filename):
     return df
 
 
+@st.cache_data
+def load_quality_summaries(folder_list):
+    """
+    Carga los resúmenes de calidad (_calidad.json) generados en la limpieza
+    
+    Returns:
+        dict: {ruta_relativa_del_archivo_modificado: resumen}
+    """
+    summaries = {}
+    
+    for folder in folder_list:
+        for root, _, files in os.walk(folder):
+            for file in files:
+                if file.endswith('_modificado.csv'):
+                    filepath = os.path.join(root, file)
+                    summary = read_quality_summary(filepath)
+                    if summary is not None:
+                        summaries[_origin_key(filepath)] = summary
+    
+    return summaries
+
+
+@st.cache_data(show_spinner="Comparando corridas...")
+def compare_run_pair(reference_origin, other_origin, reference_channel):
+    """
+    Compara dos corridas del dataset compartido (resultado cacheado por par y canal)
+    
+    Returns:
+        dict con el desfase y las estadísticas por canal (ver compare_runs)
+    """
+    all_data, file_index = load_processed_data((STATIC_DIR, DYNAMIC_DIR))
+    runs = [
+        select_data(all_data, file_index, [origin], file_index[origin]['tipo'])
+        .drop(columns=['Origen_Archivo', 'Tipo_Prueba'])
+        for origin in (reference_origin, other_origin)
+    ]
+    return compare_runs(runs[0], runs[1], reference_channel)
+
+
 # ============================================================================
 # FUNCIONES DE VISUALIZACIÓN
 # ============================================================================
 
+def _show_quality_summary(summaries, selected_origins):
+    """Muestra el resumen de calidad de los archivos seleccionados"""
+    rows = []
+    for origin in selected_origins:
+        summary = summaries.get(origin)
+        if summary is None:
+            continue
+        
+        record = summary.get('RECORD', {})
+        for channel, stats in summary.get('canales', {}).items():
+            rows.append({
+                'Archivo': origin,
+                'Canal': channel,
+                'Huecos RECORD': record.get('huecos', 0),
+                'Duplicados RECORD': record.get('duplicados', 0),
+                'Nulos': stats['nulas'],
+                'No numéricos': summary.get('valores_no_numericos', {}).get(channel, 0),
+                'Picos': stats['picos'],
+                'Congelado': stats['congelado'],
+                'Saturadas': stats['saturadas'],
+            })
+    
+    with st.expander("🩺 Calidad de Datos", expanded=False):
+        if rows:
+            st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        else:
+            st.info("No hay resúmenes de calidad. Vuelva a procesar los archivos.")
+
+
 def _plot_strain_data(df, record_range):
     """Genera gráfico de Strain vs RECORD"""
     strain_cols = [col for col in df.columns 
@@ -338,12 +480,231 @@ def _plot_accelerometer_data(df, record_range):
         st.info("Seleccione al menos un acelerómetro")
 
 
+def _export_section(folder, selected_origins, sensor_keys, record_range, key_suffix):
+    """
+    Exporta la selección actual (archivos, sensores y rango de RECORD)
+    
+    La exportación se escribe por bloques a un archivo temporal desde los
+    CSV procesados, sin copiar el DataFrame filtrado en memoria.
+    """
+    st.subheader("💾 Exportar Selección")
+    
+    folder_key = _origin_key(folder) + '/'
+    origins = [origin for origin in selected_origins if origin.startswith(folder_key)]
+    filepaths = [os.path.join(PROCESSED_DIR, *origin.split('/')) for origin in origins]
+    
+    sensors = []
+    for key in sensor_keys:
+        sensors += [col for col in st.session_state.get(key, []) if col not in sensors]
+    
+    col1, col2 = st.columns(2)
+    export_format = col1.selectbox(
+        "Formato:",
+        options=list(EXPORT_FORMATS),
+        format_func=lambda fmt: EXPORT_FORMATS[fmt][0],
+        key=f'export_format{key_suffix}'
+    )
+    
+    if col2.button("Preparar exportación", key=f'export_button{key_suffix}',
+                   disabled=not (filepaths and sensors), use_container_width=True):
+        extension, mime = EXPORT_FORMATS[export_format]
+        with tempfile.NamedTemporaryFile(dir=EXPORT_DIR, suffix=extension, delete=False) as tmp:
+            output_path = tmp.name
+        
+        try:
+            with st.spinner("Exportando datos..."):
+                rows = export_selection(filepaths, output_path, export_format,
+                                        sensors=sensors, record_range=record_range,
+                                        labels=origins)
+            
+            # El botón se muestra solo en esta ejecución: Streamlit guarda el
+            # contenido una vez y en las siguientes ejecuciones no se vuelve a
+            # leer el archivo ni se ofrece una exportación de otra selección
+            if rows:
+                with open(output_path, 'rb') as f:
+                    st.download_button(
+                        f"⬇️ Descargar {rows:,} filas ({extension})",
+                        data=f,
+                        file_name=f"seleccion{key_suffix}{extension}",
+                        mime=mime,
+                        on_click="ignore",
+                        key=f'export_download{key_suffix}'
+                    )
+            else:
+                st.info("La selección no contiene datos para exportar")
+        except Exception as e:
+            st.error(f"Error al exportar: {e}")
+        finally:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+
+
+def _run_comparison_section(all_data, file_index, selected_origins):
+    """Alinea corridas repetidas con una de referencia y muestra su repetibilidad"""
+    st.header("Comparación de Corridas Repetidas")
+    
+    dynamic_origins = [o for o in selected_origins if file_index[o]['tipo'] == 'Dinámica']
+    if len(dynamic_origins) < 2:
+        st.info("Seleccione al menos dos archivos dinámicos para comparar")
+        return
+    
+    col1, col2 = st.columns(2)
+    reference = col1.selectbox("Corrida de referencia:", options=dynamic_origins, key='compare_reference')
+    channels = [c for c in file_index[reference]['columnas']
+                if c not in ['RECORD', 'TIMESTAMP', 'Origen_Archivo', 'Tipo_Prueba']]
+    reference_channel = col2.selectbox("Canal para estimar el desfase:", options=channels,
+                                       key='compare_channel')
+    others = st.multiselect(
+        "Corridas a comparar:",
+        options=[o for o in dynamic_origins if o != reference],
+        default=[o for o in dynamic_origins if o != reference],
+        key='compare_runs'
+    )
+    
+    if not others or reference_channel is None:
+        return
+    
+    comparisons = {}
+    for other in others:
+        try:
+            comparisons[other] = compare_run_pair(reference, other, reference_channel)
+        except ValueError as e:
+            st.warning(f"{other}: {e}")
+    
+    if not comparisons:
+        return
+    
+    st.subheader("Desfase estimado")
+    st.dataframe(pd.DataFrame([
+        {'Corrida': other,
+         'Desfase (muestras)': result['desfase_muestras'],
+         'Desfase (RECORD)': result['desfase_RECORD'],
+         'Correlación en el pico': result['correlacion_pico'],
+         'Muestras comunes': result['muestras_comunes']}
+        for other, result in comparisons.items()
+    ]), use_container_width=True, hide_index=True)
+    
+    st.subheader("Repetibilidad por canal")
+    st.dataframe(repeatability_summary(comparisons), use_container_width=True, hide_index=True)
+    
+    with st.expander("Estadísticas de diferencia por corrida"):
+        for other, result in comparisons.items():
+            st.write(f"**{other}**")
+            st.dataframe(result['estadisticas'], use_container_width=True, hide_index=True)
+    
+    # Superposición de las corridas alineadas en el canal de referencia
+    plot_channel = st.selectbox("Canal a superponer:", options=channels,
+                                index=channels.index(reference_channel), key='compare_plot')
+    shifts = {reference: 0.0}
+    shifts.update({other: result['desfase_RECORD'] for other, result in comparisons.items()})
+    
+    overlay = []
+    for origin, shift in shifts.items():
+        run = select_data(all_data, file_index, [origin], 'Dinámica')
+        if plot_channel in run.columns:
+            overlay.append(pd.DataFrame({
+                'RECORD alineado': run['RECORD'].to_numpy() - shift,
+                'Valor': run[plot_channel].to_numpy(),
+                'Corrida': origin,
+            }))
+    
+    if overlay:
+        chart = alt.Chart(pd.concat(overlay, ignore_index=True)).mark_line(size=1).encode(
+            x=alt.X('RECORD alineado:Q', title='RECORD alineado a la referencia'),
+            y=alt.Y('Valor:Q', title=plot_channel),
+            color='Corrida:N',
+            tooltip=['RECORD alineado:Q', 'Corrida:N', 'Valor:Q']
+        ).properties(
+            title=f'{plot_channel} - corridas alineadas',
+            width='container',
+            height=400
+        ).interactive()
+        
+        st.altair_chart(chart, use_container_width=True)
+
+
+# ============================================================================
+# FUNCIONES DE MONITOREO EN VIVO
+# ============================================================================
+
+def _default_rules_table(channels):
+    """
+    Tabla editable de reglas de alerta para los canales numéricos, con los
+    límites del archivo .cal como valores iniciales
+    """
+    cal_rules = rules_from_cal_limits(load_cal_limits_from_dir(DATA_DIR), channels)
+    
+    return pd.DataFrame({
+        'Canal': channels,
+        'Límite inferior': [cal_rules.get(c, {}).get('inferior', np.nan) for c in channels],
+        'Límite superior': [cal_rules.get(c, {}).get('superior', np.nan) for c in channels],
+        'Tasa máx. (/RECORD)': np.nan,
+        'Muestras sostenidas': np.nan,
+    })
+
+
+def _rules_from_table(table):
+    """Convierte la tabla editada en reglas del motor de alertas (solo canales con alguna regla)"""
+    rules = {}
+    for _, row in table.iterrows():
+        rule = {
+            'inferior': row['Límite inferior'],
+            'superior': row['Límite superior'],
+            'tasa_max': row['Tasa máx. (/RECORD)'],
+            'muestras_sostenidas': row['Muestras sostenidas'],
+        }
+        if any(pd.notna(value) for value in rule.values()):
+            rules[row['Canal']] = rule
+    return rules
+
+
+@st.fragment(run_every=1)
+def _live_alerts_panel():
+    """
+    Lee las filas nuevas del archivo en vivo y las evalúa en el motor de alertas
+    
+    Se vuelve a ejecutar cada segundo sin recargar el resto de la página.
+    """
+    monitor = st.session_state.get('live_monitor')
+    if monitor is None:
+        st.info("Configure las reglas e inicie el monitoreo")
+        return
+    
+    reader, engine = monitor['reader'], monitor['engine']
+    new_rows = reader.read_new()
+    new_alerts = engine.update(new_rows) if not new_rows.empty else []
+    
+    for alert in new_alerts[-5:]:
+        st.toast(f"🚨 {alert['canal']}: {alert['tipo']} ({alert['valor']:.4g})")
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Muestras evaluadas", f"{engine.samples:,}")
+    col2.metric("Último RECORD", "-" if engine.last_record is None else f"{engine.last_record:g}")
+    col3.metric("Alertas", len(engine.alerts), delta=len(new_alerts) or None, delta_color="inverse")
+    
+    if engine.last_record is not None:
+        st.dataframe(
+            pd.DataFrame({
+                'Canal': engine.channels,
+                'Último valor': engine.last_values,
+                'Fuera de límites': engine.last_exceeded,
+                'Racha': engine.run_length,
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+    
+    if engine.alerts:
+        st.subheader("Historial de Alertas")
+        st.dataframe(pd.DataFrame(list(engine.alerts)[::-1]), use_container_width=True, hide_index=True)
+
+
 # ============================================================================
 # INTERFAZ DE USUARIO - BARRA LATERAL
 # ============================================================================
 
 st.sidebar.title("Navegación del Sistema")
-page_selection = st.sidebar.radio("Ir a:", ("Panel de Control", "Dashboard de Datos"))
+page_selection = st.sidebar.radio("Ir a:", ("Panel de Control", "Dashboard de Datos", "Monitoreo en Vivo"))
 
 st.sidebar.markdown("---")
 st.sidebar.write(f"📁 Cargar archivos en: `{os.path.join(os.getcwd(), 'datos')}`")
@@ -372,6 +733,7 @@ if page_selection == "Panel de Control":
                 with st.spinner("Procesando archivos..."):
                     count, message = run_conversion_and_cleaning()
                     st.cache_data.clear()
+                    st.cache_resource.clear()
                     
                     if count > 0:
                         st.success(f"{message} Procesados: {count} archivos")
@@ -411,10 +773,11 @@ elif page_selection == "Dashboard de Datos":
     # Botón para recargar datos
     if st.button("🔄 Recargar Datos del Disco"):
         st.cache_data.clear()
+        st.cache_resource.clear()
         st.rerun()
     
     # Cargar todos los datos procesados
-    all_data = load_processed_data([STATIC_DIR, DYNAMIC_DIR])
+    all_data, file_index = load_processed_data((STATIC_DIR, DYNAMIC_DIR))
     
     # Validar datos cargados
     if all_data.empty:
@@ -422,24 +785,24 @@ elif page_selection == "Dashboard de Datos":
     elif 'RECORD' not in all_data.columns:
         st.error("Columna 'RECORD' no encontrada en los datos")
     else:
-        all_data.dropna(subset=['RECORD'], inplace=True)
-        
         # Filtros globales en la barra lateral
         st.sidebar.header("Filtros del Dashboard")
-        origins = sorted(all_data['Origen_Archivo'].unique())
+        origins = sorted(file_index)
         selected_origins = st.sidebar.multiselect(
             "Filtrar por Archivo:",
             options=origins,
             default=origins
         )
         
-        df_filtered = all_data[all_data['Origen_Archivo'].isin(selected_origins)]
+        _show_quality_summary(load_quality_summaries([STATIC_DIR, DYNAMIC_DIR]), selected_origins)
         
-        if df_filtered.empty:
+        if not selected_origins:
             st.warning("No hay datos para los filtros seleccionados")
         else:
             # Crear pestañas para datos estáticos y dinámicos
-            tab1, tab2 = st.tabs(["Pruebas Estáticas (Strain)", "Pruebas Dinámicas (Aceleración)"])
+            tab1, tab2, tab3 = st.tabs(["Pruebas Estáticas (Strain)",
+                                        "Pruebas Dinámicas (Aceleración)",
+                                        "Comparación de Corridas"])
             
             # ================================================================
             # PESTAÑA 1: DATOS ESTÁTICOS (Strain y Desplazamiento)
@@ -447,7 +810,7 @@ elif page_selection == "Dashboard de Datos":
             with tab1:
                 st.header("Análisis de Datos Estáticos")
                 
-                df_static = df_filtered[df_filtered['Tipo_Prueba'] == 'Estática'].copy()
+                df_static = select_data(all_data, file_index, selected_origins, 'Estática')
                 
                 if df_static.empty:
                     st.info("No hay datos estáticos disponibles")
@@ -464,10 +827,8 @@ elif page_selection == "Dashboard de Datos":
                         key='slider_static'
                     )
                     
-                    df_static = df_static[
-                        (df_static['RECORD'] >= record_range[0]) & 
-                        (df_static['RECORD'] <= record_range[1])
-                    ]
+                    df_static = select_data(all_data, file_index, selected_origins,
+                                            'Estática', record_range)
                     
                     st.info(f"📊 Muestras en el rango: {len(df_static):,}")
                     
@@ -478,6 +839,12 @@ elif page_selection == "Dashboard de Datos":
                     
                     # Gráfico 2: LVDT (Desplazamiento)
                     _plot_lvdt_data(df_static, record_range, key_suffix='_static')
+                    
+                    st.markdown("---")
+                    
+                    _export_section(STATIC_DIR, selected_origins,
+                                    ['strain_select', 'lvdt_select_static'],
+                                    record_range, key_suffix='_static')
             
             # ================================================================
             # PESTAÑA 2: DATOS DINÁMICOS (Aceleración y Desplazamiento)
@@ -485,7 +852,7 @@ elif page_selection == "Dashboard de Datos":
             with tab2:
                 st.header("Análisis de Datos Dinámicos")
                 
-                df_dynamic = df_filtered[df_filtered['Tipo_Prueba'] == 'Dinámica'].copy()
+                df_dynamic = select_data(all_data, file_index, selected_origins, 'Dinámica')
                 
                 if df_dynamic.empty:
                     st.info("No hay datos dinámicos disponibles")
@@ -502,10 +869,8 @@ elif page_selection == "Dashboard de Datos":
                         key='slider_dynamic'
                     )
                     
-                    df_dynamic = df_dynamic[
-                        (df_dynamic['RECORD'] >= record_range[0]) & 
-                        (df_dynamic['RECORD'] <= record_range[1])
-                    ]
+                    df_dynamic = select_data(all_data, file_index, selected_origins,
+                                            'Dinámica', record_range)
                     
                     st.info(f"📊 Muestras en el rango: {len(df_dynamic):,}")
                     
@@ -515,4 +880,64 @@ elif page_selection == "Dashboard de Datos":
                     st.markdown("---")
                     
                     # Gráfico 2: LVDT (Desplazamiento)
-                    _plot_lvdt_data(df_dynamic, record_range, key_suffix='_dynamic')
\ No newline at end of file
+                    _plot_lvdt_data(df_dynamic, record_range, key_suffix='_dynamic')
+                    
+                    st.markdown("---")
+                    
+                    _export_section(DYNAMIC_DIR, selected_origins,
+                                    ['accel_select', 'lvdt_select_dynamic'],
+                                    record_range, key_suffix='_dynamic')
+            
+            # ================================================================
+            # PESTAÑA 3: COMPARACIÓN DE CORRIDAS REPETIDAS
+            # ================================================================
+            with tab3:
+                _run_comparison_section(all_data, file_index, selected_origins)
+
+
+# ============================================================================
+# PÁGINA 3: MONITOREO EN VIVO Y ALERTAS
+# ============================================================================
+
+elif page_selection == "Monitoreo en Vivo":
+    st.title("Monitoreo en Vivo y Alertas 🚨")
+    st.markdown("Evalúa límites, tasa de cambio y excedencias sostenidas sobre las muestras nuevas "
+                "de un archivo `.dat` o `.csv` que el sistema de adquisición está escribiendo")
+    
+    live_files = []
+    if os.path.exists(DATA_DIR):
+        live_files = sorted(f for f in os.listdir(DATA_DIR) if f.endswith(('.dat', '.csv')))
+    
+    if not live_files:
+        st.warning("No hay archivos .dat o .csv en la carpeta 'datos/'")
+    else:
+        selected_file = st.selectbox("Archivo en adquisición:", options=live_files)
+        live_path = os.path.join(DATA_DIR, selected_file)
+        channels = CsvTailReader(live_path).channels()
+        
+        if channels is None:
+            st.info("El archivo aún no tiene encabezado")
+        elif not channels:
+            st.info("El archivo no tiene canales numéricos para monitorear")
+        else:
+            with st.expander("⚙️ Reglas de Alerta", expanded='live_monitor' not in st.session_state):
+                rules_table = st.data_editor(
+                    _default_rules_table(channels),
+                    disabled=['Canal'],
+                    use_container_width=True,
+                    hide_index=True,
+                    key=f'rules_{selected_file}'
+                )
+                
+                only_new = st.checkbox("Evaluar solo las muestras nuevas", value=True)
+                
+                col1, col2 = st.columns(2)
+                if col1.button("▶️ Iniciar monitoreo", type="primary", use_container_width=True):
+                    st.session_state['live_monitor'] = {
+                        'reader': CsvTailReader(live_path, from_end=only_new),
+                        'engine': AlertEngine(_rules_from_table(rules_table)),
+                    }
+                if col2.button("⏹️ Detener", use_container_width=True):
+                    st.session_state.pop('live_monitor', None)
+            
+            _live_alerts_panel()
@@ -0,0 +1,315 @@
+"""
+Módulo de alertas en tiempo real
+Evalúa límites por canal, tasa de cambio y excedencias sostenidas de forma
+incremental sobre bloques de muestras nuevas, sin volver a recorrer el historial
+"""
+
+import pandas as pd
+import numpy as np
+import io
+import os
+from collections import deque
+
+from data_converters.calidad_datos import match_cal_limits, INDEX_COLUMNS
+
+
+# Cantidad máxima de alertas guardadas en el historial del motor
+MAX_ALERTS = 500
+
+# Filas leídas para distinguir los canales numéricos de un archivo en vivo
+CHANNEL_SAMPLE_ROWS = 100
+
+# Bloque de lectura al contar las filas existentes de un archivo
+READ_BLOCK_SIZE = 1 << 20
+
+
+class AlertEngine:
+    """
+    Motor de alertas incremental
+
+    Cada regla se define por canal con las claves opcionales:
+    - 'inferior' / 'superior': límites de valor
+    - 'tasa_max': cambio máximo permitido por unidad de RECORD
+    - 'muestras_sostenidas': muestras consecutivas fuera de límites para
+      generar una alerta de excedencia sostenida
+
+    El estado guardado entre bloques (último valor, última muestra fuera de
+    límites y racha actual) permite procesar cada muestra una sola vez.
+    """
+
+    def __init__(self, rules):
+        """
+        Args:
+            rules: dict {canal: {'inferior', 'superior', 'tasa_max', 'muestras_sostenidas'}}
+        """
+        self.channels = list(rules)
+        self.lower = np.array([_rule_value(rules[c], 'inferior', -np.inf) for c in self.channels])
+        self.upper = np.array([_rule_value(rules[c], 'superior', np.inf) for c in self.channels])
+        self.max_rate = np.array([_rule_value(rules[c], 'tasa_max', np.inf) for c in self.channels])
+        self.sustained = np.array([int(_rule_value(rules[c], 'muestras_sostenidas', 0))
+                                   for c in self.channels])
+
+        self.last_record = None
+        self.last_values = np.full(len(self.channels), np.nan)
+        self.last_exceeded = np.zeros(len(self.channels), dtype=bool)
+        self.last_fast = np.zeros(len(self.channels), dtype=bool)
+        self.run_length = np.zeros(len(self.channels), dtype=int)
+        self.alerts = deque(maxlen=MAX_ALERTS)
+        self.samples = 0
+
+    def update(self, df):
+        """
+        Procesa un bloque de muestras nuevas
+
+        Las alertas se generan solo al entrar en cada condición, no en cada
+        muestra mientras la condición se mantiene.
+
+        Args:
+            df: DataFrame con la columna RECORD y los canales con reglas
+
+        Returns:
+            Lista de alertas nuevas (dict con canal, tipo, RECORD, valor y límite)
+        """
+        if df.empty or not self.channels:
+            return []
+
+        records = pd.to_numeric(df['RECORD'], errors='coerce').to_numpy(dtype='float64')
+        values = np.column_stack([
+            pd.to_numeric(df[c], errors='coerce').to_numpy(dtype='float64')
+            if c in df.columns else np.full(len(df), np.nan)
+            for c in self.channels
+        ])
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # Límites de valor
+            exceeded = (values < self.lower) | (values > self.upper)
+            previous = np.vstack([self.last_exceeded, exceeded[:-1]])
+            crossing = exceeded & ~previous
+
+            # Tasa de cambio respecto a la muestra anterior (incluida la del bloque previo)
+            prev_values = np.vstack([self.last_values, values[:-1]])
+            prev_records = np.r_[np.nan if self.last_record is None else self.last_record,
+                                 records[:-1]]
+            rate = np.abs(values - prev_values) / (records - prev_records)[:, None]
+            fast = rate > self.max_rate
+            fast_start = fast & ~np.vstack([self.last_fast, fast[:-1]])
+
+        # Racha de muestras consecutivas fuera de límites, continuando la del bloque previo
+        counts = np.cumsum(exceeded, axis=0)
+        resets = np.maximum.accumulate(np.where(~exceeded, counts, 0), axis=0)
+        broken = np.logical_or.accumulate(~exceeded, axis=0)
+        run = counts - resets + np.where(broken, 0, self.run_length)
+        sustained = (self.sustained > 0) & (run == self.sustained)
+
+        new_alerts = []
+        for kind, mask, limit in (
+            ('Límite', crossing, None),
+            ('Tasa de cambio', fast_start, self.max_rate),
+            ('Excedencia sostenida', sustained, self.sustained),
+        ):
+            for row, col in zip(*np.nonzero(mask)):
+                value = values[row, col]
+                if limit is None:
+                    bound = self.upper[col] if value > self.upper[col] else self.lower[col]
+                else:
+                    bound = limit[col]
+                new_alerts.append({
+                    'canal': self.channels[col],
+                    'tipo': kind,
+                    'RECORD': float(records[row]),
+                    'valor': float(value),
+                    'limite': float(bound),
+                })
+
+        new_alerts.sort(key=lambda alert: alert['RECORD'])
+        self.alerts.extend(new_alerts)
+
+        # Guardar estado para el siguiente bloque
+        self.last_record = records[-1]
+        self.last_values = values[-1]
+        self.last_exceeded = exceeded[-1]
+        self.last_fast = fast[-1]
+        self.run_length = run[-1]
+        self.samples += len(df)
+
+        return new_alerts
+
+
+def _rule_value(rule, key, default):
+    """Devuelve el valor numérico de una regla o el valor por defecto si está vacío"""
+    value = rule.get(key)
+    if value is None or pd.isna(value):
+        return default
+    return float(value)
+
+
+def rules_from_cal_limits(cal_limits, columns):
+    """
+    Crea reglas de límite a partir de la calibración para las columnas presentes
+
+    Returns:
+        dict {canal: {'inferior', 'superior'}}
+    """
+    return {col: {'inferior': low, 'superior': high}
+            for col, (low, high) in match_cal_limits(columns, cal_limits).items()}
+
+
+def _record_column(columns):
+    """
+    Columna que identifica cada muestra: la que contiene 'record', el
+    contador Muestra de los archivos ESP32 o la columna de tiempo (None si no hay)
+    """
+    for matches in (lambda col: 'record' in col.lower(),
+                    lambda col: col.lower() == 'muestra',
+                    lambda col: col.lower().endswith('time')):
+        column = next((col for col in columns if matches(col)), None)
+        if column is not None:
+            return column
+    return None
+
+
+class CsvTailReader:
+    """
+    Lee de forma incremental las filas nuevas que se agregan a un archivo CSV
+
+    Guarda la posición de lectura, de modo que cada llamada a read_new()
+    solo procesa las líneas completas escritas desde la llamada anterior.
+    Los archivos .dat de Campbell (TOA5) tienen el encabezado en la segunda
+    línea seguido de dos líneas de unidades que se omiten.
+
+    RECORD se toma de la columna de registro del archivo (RECORD, Muestra o
+    el tiempo); si no existe, se numeran las filas contando también las que
+    ya estaban escritas al empezar.
+    """
+
+    def __init__(self, filepath, from_end=False):
+        """
+        Args:
+            filepath: Ruta del archivo que se está escribiendo
+            from_end: True para ignorar las filas que ya existen en el archivo
+        """
+        self.filepath = filepath
+        self.offset = 0
+        self.data_offset = 0
+        self.columns = None
+        self.separator = ','
+        self.rows = 0
+
+        if from_end and self.header() is not None:
+            self._skip_to_end()
+
+    def _skip_to_end(self):
+        """
+        Posiciona la lectura después de la última línea completa del archivo,
+        contando las filas omitidas para que la numeración continúe desde ellas
+        """
+        with open(self.filepath, 'rb') as f:
+            f.seek(self.offset)
+            position = self.offset
+            while True:
+                block = f.read(READ_BLOCK_SIZE)
+                if not block:
+                    break
+                self.rows += block.count(b'\n')
+                if b'\n' in block:
+                    self.offset = position + block.rfind(b'\n') + 1
+                position += len(block)
+
+    def _read_header(self, f):
+        """Lee el encabezado y deja el archivo posicionado en la primera fila de datos"""
+        first_line = f.readline()
+        if not first_line.endswith(b'\n'):
+            return False
+
+        if self.filepath.endswith('.dat') and first_line.startswith(b'"TOA5'):
+            header = f.readline()
+            f.readline()
+            f.readline()
+        else:
+            header = first_line
+
+        text = header.decode('utf-8', errors='replace')
+        self.separator = ';' if text.count(';') > text.count(',') else ','
+        self.columns = [col.strip().strip('"') for col in text.strip().split(self.separator)]
+        self.offset = self.data_offset = f.tell()
+        return True
+
+    def header(self):
+        """
+        Devuelve los nombres de columna del archivo sin consumir filas de datos
+
+        Returns:
+            Lista de columnas o None si el archivo aún no tiene encabezado
+        """
+        if self.columns is None and os.path.exists(self.filepath):
+            with open(self.filepath, 'rb') as f:
+                self._read_header(f)
+        return self.columns
+
+    def channels(self):
+        """
+        Canales numéricos del archivo, sin las columnas de índice ni contadores
+
+        Se determinan con las primeras filas de datos; si aún no hay filas,
+        se devuelven todas las columnas que no son de índice.
+
+        Returns:
+            Lista de canales o None si el archivo aún no tiene encabezado
+        """
+        columns = self.header()
+        if columns is None:
+            return None
+
+        excluded = set(INDEX_COLUMNS) | {_record_column(columns)}
+        candidates = [col for col in columns if col not in excluded]
+
+        with open(self.filepath, 'rb') as f:
+            f.seek(self.data_offset)
+            lines = [f.readline() for _ in range(CHANNEL_SAMPLE_ROWS)]
+        data = b''.join(line for line in lines if line.endswith(b'\n'))
+        if not data:
+            return candidates
+
+        sample = pd.read_csv(io.BytesIO(data), sep=self.separator, header=None,
+                             names=columns, na_values=['NAN', ''])
+        return [col for col in candidates if pd.api.types.is_numeric_dtype(sample[col])]
+
+    def read_new(self):
+        """
+        Devuelve las filas completas agregadas desde la última lectura
+
+        Returns:
+            DataFrame con las filas nuevas (vacío si no hay datos nuevos)
+        """
+        if not os.path.exists(self.filepath):
+            return pd.DataFrame()
+
+        if os.path.getsize(self.filepath) < self.offset:
+            # El archivo fue truncado o reemplazado: volver a empezar
+            self.offset = 0
+            self.columns = None
+            self.rows = 0
+
+        with open(self.filepath, 'rb') as f:
+            if self.columns is None and not self._read_header(f):
+                return pd.DataFrame()
+            f.seek(self.offset)
+            data = f.read()
+
+        # Procesar solo hasta la última línea completa
+        end = data.rfind(b'\n') + 1
+        if end == 0:
+            return pd.DataFrame()
+        self.offset += end
+
+        df = pd.read_csv(io.BytesIO(data[:end]), sep=self.separator, header=None,
+                         names=self.columns, na_values=['NAN', ''])
+
+        record_col = _record_column(df.columns)
+        if record_col is None:
+            df['RECORD'] = np.arange(self.rows + 1, self.rows + len(df) + 1)
+        elif record_col != 'RECORD':
+            df = df.rename(columns={record_col: 'RECORD'})
+
+        self.rows += len(df)
+        return df
@@ -0,0 +1,285 @@
+"""
+Módulo de control de calidad de datos
+Detecta huecos y duplicados en RECORD/TIMESTAMP, picos, sensores congelados
+y saturación respecto a los límites del archivo de calibración (.cal)
+"""
+
+import pandas as pd
+import numpy as np
+import csv
+import json
+import os
+import math
+import warnings
+
+
+# Umbral del z-score robusto (Iglewicz-Hoaglin) para considerar un pico
+SPIKE_Z_THRESHOLD = 3.5
+
+# Cantidad mínima de muestras idénticas consecutivas para considerar un sensor congelado
+FLATLINE_MIN_SAMPLES = 50
+
+# Columnas de índice o contadores que no son canales de medición
+INDEX_COLUMNS = ['RECORD', 'TIMESTAMP', 'Muestra']
+
+# Factor sobre el paso típico para considerar un hueco en RECORD/TIMESTAMP
+GAP_FACTOR = 1.5
+
+
+def quality_summary_path(modified_csv_path):
+    """
+    Devuelve la ruta del resumen de calidad asociado a un archivo _modificado.csv
+
+    Args:
+        modified_csv_path: Ruta del archivo CSV limpio
+
+    Returns:
+        Ruta del archivo JSON con el resumen de calidad
+    """
+    base = modified_csv_path
+    if base.endswith('_modificado.csv'):
+        base = base[:-len('_modificado.csv')]
+    else:
+        base = os.path.splitext(base)[0]
+    return f"{base}_calidad.json"
+
+
+def load_cal_limits(cal_filepath):
+    """
+    Lee los límites superior e inferior de cada sensor desde un archivo .cal
+
+    El archivo puede tener varios bloques separados por líneas vacías y
+    encabezados que empiezan con '\\'. Las columnas LimitUpper y LimitLower
+    son la 10ª y 11ª de cada fila. Si ambos límites son positivos se
+    interpretan como magnitudes (±límite). Las filas sin límites finitos
+    (p. ej. 'NaN') se omiten.
+
+    Args:
+        cal_filepath: Ruta del archivo .cal
+
+    Returns:
+        dict: {nombre_sensor: (limite_inferior, limite_superior)}
+    """
+    limits = {}
+
+    with open(cal_filepath, 'r', encoding='utf-8', errors='replace') as f:
+        for row in csv.reader(f):
+            if not row or row[0].startswith('\\') or len(row) < 11:
+                continue
+            try:
+                upper = float(row[9])
+                lower = float(row[10])
+            except ValueError:
+                continue
+            if not (math.isfinite(upper) and math.isfinite(lower)):
+                continue
+
+            if lower > 0:
+                lower = -lower
+            limits[row[0].strip()] = (min(lower, upper), max(lower, upper))
+
+    return limits
+
+
+def load_cal_limits_from_dir(data_dir):
+    """
+    Carga y combina los límites de todos los archivos .cal de una carpeta
+
+    Returns:
+        dict: {nombre_sensor: (limite_inferior, limite_superior)}
+    """
+    limits = {}
+
+    if not os.path.isdir(data_dir):
+        return limits
+
+    for filename in sorted(os.listdir(data_dir)):
+        if filename.lower().endswith('.cal'):
+            try:
+                limits.update(load_cal_limits(os.path.join(data_dir, filename)))
+            except OSError as e:
+                print(f"✗ Error al leer calibración {filename}: {e}")
+
+    return limits
+
+
+def match_cal_limits(columns, cal_limits):
+    """
+    Asocia cada columna de datos con sus límites de calibración
+
+    La comparación no distingue mayúsculas y acepta el nombre del sensor
+    sin el sufijo de calibración (p. ej. 'LV214558_21A' -> 'LV214558').
+    """
+    lookup = {}
+    for name, bounds in cal_limits.items():
+        lookup[name.lower()] = bounds
+        lookup.setdefault(name.split('_')[0].lower(), bounds)
+
+    return {col: lookup[col.lower()] for col in columns if col.lower() in lookup}
+
+
+def _index_gaps(series):
+    """
+    Cuenta huecos, duplicados y retrocesos en una columna de índice
+
+    Un hueco es un salto mayor que GAP_FACTOR veces el paso típico (mediana).
+
+    Returns:
+        dict con los conteos y el paso típico
+    """
+    values = series.dropna()
+    if pd.api.types.is_datetime64_any_dtype(values):
+        values = values.astype('datetime64[ns]').astype('int64') / 1e9
+    values = values.to_numpy(dtype='float64')
+
+    if len(values) < 2:
+        return {'paso': None, 'huecos': 0, 'muestras_faltantes': 0,
+                'duplicados': 0, 'retrocesos': 0}
+
+    steps = np.diff(values)
+    positive = steps[steps > 0]
+    step = float(np.median(positive)) if len(positive) else 0.0
+
+    gaps = steps > step * GAP_FACTOR if step > 0 else np.zeros_like(steps, dtype=bool)
+    missing = np.round(steps[gaps] / step).sum() - gaps.sum() if step > 0 else 0
+
+    return {
+        'paso': step,
+        'huecos': int(gaps.sum()),
+        'muestras_faltantes': int(missing),
+        'duplicados': int(pd.Series(values).duplicated().sum()),
+        'retrocesos': int((steps < 0).sum()),
+    }
+
+
+def _longest_constant_run(values):
+    """
+    Longitud de la racha más larga de valores consecutivos idénticos por columna
+
+    Args:
+        values: Matriz (muestras x canales)
+
+    Returns:
+        ndarray con la racha más larga (en muestras) de cada canal
+    """
+    if values.shape[0] < 2:
+        return np.ones(values.shape[1], dtype=int)
+
+    same = np.diff(values, axis=0) == 0
+    counts = np.cumsum(same, axis=0)
+    # Restar el conteo acumulado en el último punto donde se rompió la racha
+    resets = np.maximum.accumulate(np.where(~same, counts, 0), axis=0)
+    return (counts - resets).max(axis=0) + 1
+
+
+def analyze_data_quality(df, cal_limits=None, extra=None):
+    """
+    Analiza la calidad de todos los canales numéricos de un DataFrame
+
+    Todos los canales se evalúan a la vez sobre una matriz NumPy:
+    - Huecos, duplicados y retrocesos en RECORD y TIMESTAMP
+    - Picos aislados mediante z-score robusto (MAD) de las primeras diferencias
+    - Sensores congelados (valores idénticos consecutivos)
+    - Muestras fuera de los límites del archivo .cal
+
+    Args:
+        df: DataFrame con los datos ya convertidos a numérico
+        cal_limits: dict {sensor: (inferior, superior)} opcional
+        extra: dict opcional con conteos adicionales de la limpieza
+
+    Returns:
+        dict con el resumen de calidad por archivo y por canal
+    """
+    summary = {'muestras': int(len(df))}
+
+    if 'RECORD' in df.columns:
+        summary['RECORD'] = _index_gaps(df['RECORD'])
+    if 'TIMESTAMP' in df.columns and pd.api.types.is_datetime64_any_dtype(df['TIMESTAMP']):
+        summary['TIMESTAMP'] = _index_gaps(df['TIMESTAMP'])
+    if extra:
+        summary.update(extra)
+
+    channels = [col for col in df.columns
+                if col not in INDEX_COLUMNS
+                and pd.api.types.is_numeric_dtype(df[col])]
+    summary['canales'] = {}
+
+    if not channels or df.empty:
+        return summary
+
+    values = df[channels].to_numpy(dtype='float64')
+    valid = ~np.isnan(values)
+
+    # Picos: z-score robusto de las primeras diferencias. Un pico aislado produce
+    # dos saltos grandes de signo opuesto rodeados de saltos normales; un cambio
+    # de nivel produce solo uno y una vibración, saltos grandes consecutivos
+    spikes = np.zeros_like(valid)
+    if len(values) >= 3:
+        steps = np.diff(values, axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+            # nanmedian advierte en canales completamente vacíos
+            warnings.simplefilter('ignore', RuntimeWarning)
+            center = np.nanmedian(steps, axis=0)
+            spread = np.nanmedian(np.abs(steps - center), axis=0) / 0.6745
+            # Datos cuantizados con MAD nula: usar la desviación absoluta media
+            mean_spread = np.nanmean(np.abs(steps - center), axis=0) * 1.2533
+            spread = np.where(spread > 0, spread, mean_spread)
+            robust_z = (steps - center) / spread
+        jump = np.abs(robust_z) > SPIKE_Z_THRESHOLD
+        reverse = np.sign(steps[:-1]) == -np.sign(steps[1:])
+        pair = jump[:-1] & jump[1:] & reverse
+        calm = ~jump
+        pair[1:] &= calm[:-2]
+        pair[:-1] &= calm[2:]
+        spikes[1:-1] = pair
+        spikes[:, ~(spread > 0)] = False
+
+    # Sensores congelados
+    flat_run = _longest_constant_run(values)
+
+    # Saturación respecto a la calibración
+    matched = match_cal_limits(channels, cal_limits or {})
+    lower = np.full(len(channels), -np.inf)
+    upper = np.full(len(channels), np.inf)
+    for i, col in enumerate(channels):
+        if col in matched:
+            lower[i], upper[i] = matched[col]
+    saturated = (values <= lower) | (values >= upper)
+
+    valid_count = valid.sum(axis=0)
+    spike_count = spikes.sum(axis=0)
+    saturated_count = saturated.sum(axis=0)
+
+    for i, col in enumerate(channels):
+        summary['canales'][col] = {
+            'validas': int(valid_count[i]),
+            'nulas': int(len(df) - valid_count[i]),
+            'picos': int(spike_count[i]),
+            'racha_constante_max': int(flat_run[i]),
+            'congelado': bool(flat_run[i] >= FLATLINE_MIN_SAMPLES),
+            'saturadas': int(saturated_count[i]),
+            'limites_cal': list(matched[col]) if col in matched else None,
+        }
+
+    return summary
+
+
+def write_quality_summary(summary, output_filepath):
+    """Guarda el resumen de calidad en formato JSON"""
+    os.makedirs(os.path.dirname(output_filepath) or '.', exist_ok=True)
+    with open(output_filepath, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2, allow_nan=False)
+
+
+def read_quality_summary(modified_csv_path):
+    """
+    Lee el resumen de calidad asociado a un archivo _modificado.csv
+
+    Returns:
+        dict con el resumen o None si no existe
+    """
+    path = quality_summary_path(modified_csv_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,188 @@
+"""
+Módulo de comparación de corridas repetidas
+Estima el desfase entre corridas mediante correlación cruzada por FFT,
+alinea todos los canales y calcula estadísticas de diferencia y repetibilidad
+"""
+
+import pandas as pd
+import numpy as np
+
+
+def _channel_matrix(df, channels):
+    """
+    Matriz (muestras x canales) ordenada por RECORD, con NaN donde falte el canal
+    """
+    df = df.sort_values('RECORD')
+    return np.column_stack([
+        df[c].to_numpy(dtype='float64') if c in df.columns else np.full(len(df), np.nan)
+        for c in channels
+    ])
+
+
+def estimate_lag(reference, other, max_lag=None):
+    """
+    Estima el desfase entre dos señales con correlación cruzada por FFT
+
+    Las señales se centran (media cero) y los NaN se reemplazan por cero.
+    Un desfase positivo indica que el evento aparece más tarde en 'other'.
+
+    Args:
+        reference: Señal de referencia (1D)
+        other: Señal a alinear (1D)
+        max_lag: Desfase máximo en muestras a considerar (None = sin límite)
+
+    Returns:
+        tuple: (desfase_en_muestras, correlación_normalizada_en_el_pico)
+    """
+    a = np.nan_to_num(reference - np.nanmean(reference))
+    b = np.nan_to_num(other - np.nanmean(other))
+
+    size = len(a) + len(b) - 1
+    nfft = 1 << (size - 1).bit_length()
+    corr = np.fft.irfft(np.conj(np.fft.rfft(a, nfft)) * np.fft.rfft(b, nfft), nfft)
+
+    # Reordenar para que los índices correspondan a desfases -(len(a)-1) ... len(b)-1
+    corr = np.concatenate([corr[-(len(a) - 1):], corr[:len(b)]]) if len(a) > 1 else corr[:len(b)]
+    lags = np.arange(-(len(a) - 1), len(b))
+
+    if max_lag is not None:
+        keep = np.abs(lags) <= max_lag
+        corr, lags = corr[keep], lags[keep]
+
+    best = int(np.argmax(corr))
+    norm = np.sqrt(np.sum(a ** 2) * np.sum(b ** 2))
+    return int(lags[best]), float(corr[best] / norm) if norm > 0 else 0.0
+
+
+def align_runs(reference_df, other_df, channels, lag):
+    """
+    Recorta ambas corridas a la zona común después de desplazar 'other' en 'lag' muestras
+
+    Returns:
+        tuple: (matriz_referencia, matriz_alineada) con los mismos canales y largo
+    """
+    ref = _channel_matrix(reference_df, channels)
+    other = _channel_matrix(other_df, channels)
+
+    if lag >= 0:
+        other = other[lag:]
+    else:
+        ref = ref[-lag:]
+
+    length = min(len(ref), len(other))
+    return ref[:length], other[:length]
+
+
+def _record_shift(reference_df, other_df, lag):
+    """
+    Desplazamiento en RECORD que lleva la corrida al origen de la referencia
+
+    Se toma de los RECORD reales de las muestras que quedan alineadas, por
+    lo que vale aunque las corridas empiecen en RECORD o tiempos distintos.
+    """
+    ref_records = np.sort(reference_df['RECORD'].to_numpy(dtype='float64'))
+    other_records = np.sort(other_df['RECORD'].to_numpy(dtype='float64'))
+
+    if lag >= 0:
+        return float(other_records[lag] - ref_records[0])
+    return float(other_records[0] - ref_records[-lag])
+
+
+def compare_runs(reference_df, other_df, reference_channel, max_lag=None):
+    """
+    Compara dos corridas alineándolas según un canal de referencia
+
+    Todas las estadísticas se calculan a la vez para todos los canales
+    comunes a ambas corridas. Las diferencias y correlaciones usan la zona
+    común alineada; los picos se toman de cada corrida completa, de modo que
+    el pico de la referencia es el mismo en todas las comparaciones.
+
+    Args:
+        reference_df: DataFrame de la corrida de referencia (con RECORD)
+        other_df: DataFrame de la corrida a comparar (con RECORD)
+        reference_channel: Canal usado para estimar el desfase
+        max_lag: Desfase máximo en muestras. Por defecto la mitad de la
+            corrida más corta, para exigir que al menos la mitad se superponga
+
+    Returns:
+        dict con el desfase (en muestras y en RECORD: lo que hay que restar al
+        RECORD de la corrida para llevarla al de la referencia), la
+        correlación en el pico y un DataFrame de estadísticas por canal
+    """
+    channels = [col for col in reference_df.columns
+                if col in other_df.columns and col != 'RECORD'
+                and pd.api.types.is_numeric_dtype(reference_df[col])
+                and reference_df[col].notna().any() and other_df[col].notna().any()]
+
+    if reference_channel not in channels:
+        raise ValueError(f"El canal {reference_channel} no está en ambas corridas")
+
+    ref_signal = reference_df.sort_values('RECORD')[reference_channel].to_numpy(dtype='float64')
+    other_signal = other_df.sort_values('RECORD')[reference_channel].to_numpy(dtype='float64')
+    if max_lag is None:
+        max_lag = min(len(ref_signal), len(other_signal)) // 2
+    lag, peak_corr = estimate_lag(ref_signal, other_signal, max_lag)
+
+    ref, other = align_runs(reference_df, other_df, channels, lag)
+    diff = other - ref
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ref_c = ref - np.nanmean(ref, axis=0)
+        other_c = other - np.nanmean(other, axis=0)
+        pearson = np.nansum(ref_c * other_c, axis=0) / np.sqrt(
+            np.nansum(ref_c ** 2, axis=0) * np.nansum(other_c ** 2, axis=0))
+        rms_ref = np.sqrt(np.nanmean(ref ** 2, axis=0))
+        rms_diff = np.sqrt(np.nanmean(diff ** 2, axis=0))
+        peak_ref = np.nanmax(np.abs(_channel_matrix(reference_df, channels)), axis=0)
+        peak_other = np.nanmax(np.abs(_channel_matrix(other_df, channels)), axis=0)
+
+        stats = pd.DataFrame({
+            'Canal': channels,
+            'Diferencia media': np.nanmean(diff, axis=0),
+            'RMS diferencia': rms_diff,
+            'Máx. |diferencia|': np.nanmax(np.abs(diff), axis=0),
+            'RMS diferencia (%)': 100 * rms_diff / rms_ref,
+            'Correlación': pearson,
+            'Pico referencia': peak_ref,
+            'Pico corrida': peak_other,
+            'Razón de picos': peak_other / peak_ref,
+        })
+
+    return {
+        'desfase_muestras': lag,
+        'desfase_RECORD': _record_shift(reference_df, other_df, lag),
+        'correlacion_pico': peak_corr,
+        'muestras_comunes': len(ref),
+        'estadisticas': stats,
+    }
+
+
+def repeatability_summary(comparisons):
+    """
+    Resume la repetibilidad de varias corridas comparadas contra la misma referencia
+
+    Args:
+        comparisons: dict {corrida: resultado de compare_runs}
+
+    Returns:
+        DataFrame por canal con la media y el coeficiente de variación de los
+        picos (incluida la referencia) y la correlación mínima
+    """
+    if not comparisons:
+        return pd.DataFrame()
+
+    stats = pd.concat(
+        [result['estadisticas'].set_index('Canal') for result in comparisons.values()],
+        keys=list(comparisons), names=['Corrida', 'Canal']
+    )
+    peaks = stats['Pico corrida'].unstack('Corrida')
+    reference_peak = stats['Pico referencia'].groupby('Canal').first()
+    peaks['Referencia'] = reference_peak
+
+    summary = pd.DataFrame({
+        'Pico medio': peaks.mean(axis=1),
+        'CV picos (%)': 100 * peaks.std(axis=1) / peaks.mean(axis=1),
+        'Correlación mínima': stats['Correlación'].groupby('Canal').min(),
+        'RMS diferencia máx. (%)': stats['RMS diferencia (%)'].groupby('Canal').max(),
+    })
+    return summary.reset_index()
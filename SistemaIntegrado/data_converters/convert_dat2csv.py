@@ -1,8 +1,10 @@
 import pandas as pd
 
-def convert_dat_to_csv(input_filepath, output_filepath):
+def convert_dat_to_csv(input_filepath, output_filepath, raise_errors=False):
     """
     Convierte archivos .dat de Campbell Scientific a .csv
+
+    Con raise_errors=True el error se propaga en lugar de solo mostrarse
     """
     try:
         df = pd.read_csv(input_filepath, delimiter=',', skiprows=[0, 2, 3])
@@ -10,4 +12,6 @@ def convert_dat_to_csv(input_filepath, output_filepath):
         df.to_csv(output_filepath, index=False)
         print(f" Archivo '{input_filepath}' convertido a '{output_filepath}' con éxito.")
     except Exception as e:
-        print(f" Error al convertir el archivo {input_filepath}: {e}")
\ No newline at end of file
+        print(f" Error al convertir el archivo {input_filepath}: {e}")
+        if raise_errors:
+            raise
\ No newline at end of file
@@ -1,9 +1,11 @@
 import pandas as pd
 from nptdms import TdmsFile
 
-def convert_tdms_to_csv(input_filepath, output_filepath):
+def convert_tdms_to_csv(input_filepath, output_filepath, raise_errors=False):
     """
     Convierte archivos .tdms de Bridge Diagnostics (BDI) a .csv
+
+    Con raise_errors=True el error se propaga en lugar de solo mostrarse
     """
     try:
         with TdmsFile.open(input_filepath) as tdms_file:
@@ -17,4 +19,6 @@ def convert_tdms_to_csv(input_filepath, output_filepath):
             df.to_csv(output_filepath, index=False)
             print(f" Archivo '{input_filepath}' convertido a '{output_filepath}' con éxito.")
     except Exception as e:
-        print(f" Error al convertir el archivo {input_filepath}: {e}")
\ No newline at end of file
+        print(f" Error al convertir el archivo {input_filepath}: {e}")
+        if raise_errors:
+            raise
\ No newline at end of file
@@ -0,0 +1,293 @@
+"""
+Módulo de exportación de datos filtrados
+Escribe por bloques la selección de archivos, sensores y rango de RECORD
+en Parquet, CSV comprimido o TDMS sin cargar todo el conjunto en memoria
+"""
+
+import pandas as pd
+import gzip
+import os
+
+
+# Filas leídas por bloque en cada archivo
+EXPORT_CHUNKSIZE = 200_000
+
+# Filas leídas al inicio de cada archivo para distinguir columnas numéricas y de texto
+TYPE_SAMPLE_ROWS = 1000
+
+# Formatos soportados: extensión del archivo de salida y tipo MIME
+EXPORT_FORMATS = {
+    'parquet': ('.parquet', 'application/octet-stream'),
+    'csv': ('.csv.gz', 'application/gzip'),
+    'tdms': ('.tdms', 'application/octet-stream'),
+}
+
+
+def with_export_extension(output_filepath, export_format):
+    """
+    Ajusta la extensión de la ruta de salida a la del formato
+    (por ejemplo 'datos.csv' -> 'datos.csv.gz' para CSV comprimido)
+    """
+    extension, _ = EXPORT_FORMATS[export_format]
+    if output_filepath.endswith(extension):
+        return output_filepath
+
+    for known, _ in sorted(EXPORT_FORMATS.values(), key=lambda fmt: -len(fmt[0])):
+        if output_filepath.endswith(known):
+            return output_filepath[:-len(known)] + extension
+    if output_filepath.endswith('.csv'):
+        return output_filepath[:-len('.csv')] + extension
+    return output_filepath + extension
+
+
+def _empty_chunk(columns, text_columns):
+    """Bloque sin filas con los mismos tipos que los bloques con datos"""
+    dtypes = {col: 'string' if col in text_columns else 'float64' for col in columns}
+    if 'TIMESTAMP' in columns:
+        dtypes['TIMESTAMP'] = 'datetime64[ns]'
+    dtypes['Origen_Archivo'] = 'string'
+    return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in dtypes.items()})
+
+
+def _export_columns(filepaths, sensors):
+    """
+    Determina las columnas comunes de la exportación leyendo solo encabezados
+
+    Returns:
+        Lista de columnas: RECORD, TIMESTAMP (si existe) y los sensores presentes
+    """
+    available = []
+    for filepath in filepaths:
+        for col in pd.read_csv(filepath, nrows=0).columns:
+            if col not in available:
+                available.append(col)
+
+    columns = ['RECORD']
+    if 'TIMESTAMP' in available:
+        columns.append('TIMESTAMP')
+    columns += [col for col in available
+                if col not in ['RECORD', 'TIMESTAMP']
+                and (sensors is None or col in sensors)]
+    return columns
+
+
+def _text_columns(filepaths, columns):
+    """
+    Columnas que no son numéricas (fechas, horas, etiquetas) según una
+    muestra del inicio de cada archivo
+
+    Una columna es de texto si en algún archivo tiene valores que pandas
+    no interpreta como números; esas columnas se exportan como texto.
+    """
+    text = set()
+    for filepath in filepaths:
+        sample = pd.read_csv(filepath, nrows=TYPE_SAMPLE_ROWS,
+                             usecols=lambda col: col in columns)
+        for col in sample.columns:
+            if col not in ['RECORD', 'TIMESTAMP'] and sample[col].notna().any() \
+                    and not pd.api.types.is_numeric_dtype(sample[col]):
+                text.add(col)
+    return [col for col in columns if col in text]
+
+
+def _count_coerced(coerced, col, before, after):
+    """Acumula los valores no nulos que se perdieron al convertir una columna"""
+    lost = int((before.notna() & after.isna()).sum())
+    if lost:
+        coerced[col] = coerced.get(col, 0) + lost
+
+
+def _origin_labels(filepaths):
+    """
+    Etiquetas Origen_Archivo únicas: la ruta de cada archivo relativa a la
+    carpeta común a todos (el nombre del archivo si están en la misma carpeta)
+    """
+    paths = [os.path.abspath(path) for path in filepaths]
+    common = os.path.commonpath([os.path.dirname(path) for path in paths])
+    return [os.path.relpath(path, common).replace(os.sep, '/') for path in paths]
+
+
+def iter_filtered_chunks(filepaths, sensors=None, record_range=None,
+                         chunksize=EXPORT_CHUNKSIZE, labels=None, coerced=None):
+    """
+    Recorre por bloques los archivos seleccionados aplicando los filtros
+
+    Cada bloque tiene las mismas columnas (las que falten en un archivo se
+    rellenan con NaN) más la columna Origen_Archivo. Si ninguna fila pasa
+    los filtros se entrega un único bloque vacío, para que el archivo de
+    salida se cree igual con sus columnas. Los sensores numéricos
+    se convierten a float64 y las columnas de texto (Fecha, Hora...) se
+    conservan como texto.
+
+    Args:
+        filepaths: Lista de rutas de archivos _modificado.csv
+        sensors: Lista de sensores a exportar (None = todos)
+        record_range: Tupla (min, max) de RECORD o None
+        labels: Valores de Origen_Archivo de cada archivo (por defecto, la
+            ruta relativa a la carpeta común)
+        coerced: dict opcional donde se acumulan, por columna, los valores
+            no nulos que no se pudieron convertir (quedan como NaN)
+
+    Yields:
+        DataFrame con un bloque de datos filtrados
+    """
+    columns = _export_columns(filepaths, sensors)
+    text_columns = _text_columns(filepaths, columns)
+    value_columns = [col for col in columns
+                     if col not in ['RECORD', 'TIMESTAMP'] and col not in text_columns]
+    if coerced is None:
+        coerced = {}
+    empty = True
+
+    if labels is None:
+        labels = _origin_labels(filepaths)
+
+    for filepath, label in zip(filepaths, labels):
+        reader = pd.read_csv(filepath, chunksize=chunksize,
+                             usecols=lambda col: col in columns)
+
+        for chunk in reader:
+            # RECORD como float64 para que todos los bloques compartan el mismo esquema
+            chunk['RECORD'] = pd.to_numeric(chunk['RECORD'], errors='coerce').astype('float64')
+            if record_range is not None:
+                mask = chunk['RECORD'].between(record_range[0], record_range[1])
+                chunk = chunk[mask]
+            if chunk.empty:
+                continue
+
+            chunk = chunk.reindex(columns=columns)
+            for col in value_columns:
+                numeric = pd.to_numeric(chunk[col], errors='coerce').astype('float64')
+                _count_coerced(coerced, col, chunk[col], numeric)
+                chunk[col] = numeric
+            for col in text_columns:
+                chunk[col] = chunk[col].astype('string')
+            if 'TIMESTAMP' in columns:
+                timestamps = pd.to_datetime(chunk['TIMESTAMP'], errors='coerce')
+                _count_coerced(coerced, 'TIMESTAMP', chunk['TIMESTAMP'], timestamps)
+                chunk['TIMESTAMP'] = timestamps
+            chunk['Origen_Archivo'] = label
+            empty = False
+            yield chunk
+
+    if empty:
+        yield _empty_chunk(columns, text_columns)
+
+
+def _write_parquet(chunks, output):
+    """Escribe los bloques en un único archivo Parquet"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(output, table.schema, compression='snappy')
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _write_csv(chunks, output):
+    """Escribe los bloques en un CSV comprimido con gzip"""
+    with gzip.open(output, 'wt', encoding='utf-8', newline='') as f:
+        header = True
+        for chunk in chunks:
+            chunk.to_csv(f, index=False, header=header)
+            header = False
+
+
+def _write_tdms(chunks, output):
+    """Escribe los bloques como segmentos sucesivos de un archivo TDMS"""
+    from nptdms import TdmsWriter, ChannelObject
+
+    group = 'Exportacion'
+    with TdmsWriter(output) as writer:
+        for chunk in chunks:
+            channels = []
+            for col in chunk.columns:
+                if col == 'Origen_Archivo':
+                    values = chunk[col].to_numpy(dtype=str)
+                elif not pd.api.types.is_numeric_dtype(chunk[col]) and col != 'TIMESTAMP':
+                    values = chunk[col].fillna('').to_numpy(dtype=str)
+                elif col == 'TIMESTAMP':
+                    # TDMS no admite marcas de tiempo nulas: se guardan como texto ISO
+                    values = chunk[col].dt.strftime('%Y-%m-%dT%H:%M:%S.%f').fillna('').to_numpy(dtype=str)
+                else:
+                    values = chunk[col].to_numpy()
+                channels.append(ChannelObject(group, col, values))
+            writer.write_segment(channels)
+
+
+_WRITERS = {
+    'parquet': _write_parquet,
+    'csv': _write_csv,
+    'tdms': _write_tdms,
+}
+
+
+def export_frame(df, output_filepath, export_format):
+    """
+    Escribe un DataFrame completo en el formato indicado, sin filtros ni
+    conversiones: se conservan sus columnas y tipos tal como están
+
+    Args:
+        df: DataFrame a escribir
+        output_filepath: Ruta del archivo de salida
+        export_format: 'parquet', 'csv' (gzip) o 'tdms'
+    """
+    if export_format not in _WRITERS:
+        raise ValueError(f"Formato de exportación no soportado: {export_format}")
+
+    os.makedirs(os.path.dirname(output_filepath) or '.', exist_ok=True)
+    _WRITERS[export_format]([df], output_filepath)
+
+
+def export_selection(filepaths, output_filepath, export_format,
+                     sensors=None, record_range=None, chunksize=EXPORT_CHUNKSIZE, labels=None):
+    """
+    Exporta la selección de archivos, sensores y rango de RECORD
+
+    Los datos se leen y escriben por bloques, de modo que la memoria usada
+    depende del tamaño del bloque y no del tamaño de la exportación.
+
+    Args:
+        filepaths: Lista de rutas de archivos _modificado.csv
+        output_filepath: Ruta del archivo de salida
+        export_format: 'parquet', 'csv' (gzip) o 'tdms'
+        sensors: Lista de sensores a exportar (None = todos)
+        record_range: Tupla (min, max) de RECORD o None
+        labels: Valores de Origen_Archivo de cada archivo (opcional)
+
+    Los valores que no se pudieron convertir a número o fecha se informan
+    al terminar, por columna.
+
+    Returns:
+        Cantidad de filas exportadas
+    """
+    if export_format not in _WRITERS:
+        raise ValueError(f"Formato de exportación no soportado: {export_format}")
+    if not filepaths:
+        raise ValueError("No hay archivos seleccionados para exportar")
+
+    os.makedirs(os.path.dirname(output_filepath) or '.', exist_ok=True)
+
+    row_count = 0
+    coerced = {}
+
+    def counted(chunks):
+        nonlocal row_count
+        for chunk in chunks:
+            row_count += len(chunk)
+            yield chunk
+
+    chunks = iter_filtered_chunks(filepaths, sensors, record_range, chunksize, labels, coerced)
+    _WRITERS[export_format](counted(chunks), output_filepath)
+
+    print(f"✓ Exportadas {row_count:,} filas a '{output_filepath}'")
+    if coerced:
+        print(f"⚠ Valores no convertibles exportados como vacíos: {coerced}")
+    return row_count
@@ -0,0 +1,160 @@
+"""
+Flujo de procesamiento por archivo compartido por la interfaz y la línea de comandos
+Convierte, clasifica y limpia cada archivo con los mismos pasos en ambos casos
+"""
+
+import pandas as pd
+import os
+import shutil
+import time
+
+from data_converters.convert_dat2csv import convert_dat_to_csv
+from data_converters.convert_tdms2csv import convert_tdms_to_csv
+from data_converters.procesar_archivos import clean_data_csv, clean_dynamic_data
+from data_converters.exportar_datos import export_frame, EXPORT_FORMATS
+from data_converters.calidad_datos import quality_summary_path
+
+
+# Subcarpetas de salida según el tipo de prueba
+STATIC_SUBDIR = "Pruebas_Estaticas"
+DYNAMIC_SUBDIR = "Pruebas_Dinamicas"
+
+# Extensiones de entrada soportadas
+SUPPORTED_EXTENSIONS = ('.dat', '.csv', '.tdms')
+
+
+def get_target_directory(filename, static_dir, dynamic_dir):
+    """
+    Determina el directorio destino según la extensión del archivo
+
+    Campbell (.dat) y ESP32 (.csv) son pruebas estáticas, BDI (.tdms) dinámicas
+
+    Returns:
+        tuple: (directorio_destino, es_estatico) o (None, None) si no es soportado
+    """
+    if filename.endswith('.dat') or filename.endswith('.csv'):
+        return static_dir, True
+    elif filename.endswith('.tdms'):
+        return dynamic_dir, False
+    return None, None
+
+
+def convert_file(filename, input_path, output_path, target_dir, raise_errors=False):
+    """Convierte archivos .dat, .tdms o .csv a formato CSV normalizado"""
+    os.makedirs(target_dir, exist_ok=True)
+
+    if filename.endswith('.dat'):
+        convert_dat_to_csv(input_path, output_path, raise_errors)
+    elif filename.endswith('.tdms'):
+        convert_tdms_to_csv(input_path, output_path, raise_errors)
+    elif filename.endswith('.csv'):
+        shutil.copy(input_path, output_path)
+
+
+def output_paths(input_path, static_dir, dynamic_dir, relative_dir=''):
+    """
+    Rutas de salida de un archivo de entrada
+
+    Returns:
+        tuple: (csv_original, csv_modificado) o None si el archivo no es soportado
+    """
+    filename = os.path.basename(input_path)
+    base_name = os.path.splitext(filename)[0]
+    target_dir, _ = get_target_directory(filename, static_dir, dynamic_dir)
+    if target_dir is None:
+        return None
+
+    target_dir = os.path.join(target_dir, relative_dir)
+    return (os.path.join(target_dir, f"{base_name}_original.csv"),
+            os.path.join(target_dir, f"{base_name}_modificado.csv"))
+
+
+def extra_output_path(modified_csv, export_format):
+    """Ruta de la copia del archivo limpio en el formato adicional (None para 'csv')"""
+    if not export_format or export_format == 'csv':
+        return None
+    extension, _ = EXPORT_FORMATS[export_format]
+    return modified_csv[:-len('.csv')] + extension
+
+
+def _read_cleaned_csv(modified_csv):
+    """Lee el CSV limpio restaurando TIMESTAMP como fecha (la limpieza ya lo normalizó)"""
+    df = pd.read_csv(modified_csv)
+    if 'TIMESTAMP' in df.columns:
+        df['TIMESTAMP'] = pd.to_datetime(df['TIMESTAMP'])
+    return df
+
+
+def _remove_files(paths):
+    """Elimina los archivos indicados que existan"""
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def process_file(input_path, static_dir, dynamic_dir, cal_limits=None,
+                 relative_dir='', export_format=None):
+    """
+    Convierte y limpia un archivo de datos
+
+    Las salidas previas del mismo archivo se eliminan antes de procesarlo y
+    las parciales se eliminan si falla, para que un fallo no deje resultados
+    incompletos o anteriores como si fueran nuevos. El error registrado es
+    la excepción original de la conversión o la limpieza.
+
+    Args:
+        input_path: Ruta del archivo .dat, .tdms o .csv
+        static_dir: Carpeta de salida para pruebas estáticas
+        dynamic_dir: Carpeta de salida para pruebas dinámicas
+        cal_limits: Límites de calibración {sensor: (inferior, superior)}
+        relative_dir: Subcarpeta (relativa a la entrada) que se replica en la salida
+        export_format: Formato adicional del archivo limpio ('parquet', 'tdms')
+
+    Returns:
+        dict con el archivo, su estado ('ok', 'error', 'omitido'), la salida y el error
+    """
+    filename = os.path.basename(input_path)
+    result = {'archivo': input_path, 'estado': 'omitido', 'salida': None, 'error': None}
+
+    paths = output_paths(input_path, static_dir, dynamic_dir, relative_dir)
+    if paths is None:
+        return result  # Archivo no soportado
+
+    original_csv, modified_csv = paths
+    target_dir = os.path.dirname(modified_csv)
+    _, is_static = get_target_directory(filename, static_dir, dynamic_dir)
+    start = time.perf_counter()
+
+    outputs = [original_csv, modified_csv, quality_summary_path(modified_csv)]
+    extra_output = extra_output_path(modified_csv, export_format)
+    if extra_output is not None:
+        outputs.append(extra_output)
+
+    try:
+        _remove_files(outputs)
+
+        # Convertir archivo al formato CSV
+        convert_file(filename, input_path, original_csv, target_dir, raise_errors=True)
+        if not os.path.exists(original_csv):
+            raise RuntimeError("la conversión no generó el CSV original")
+
+        # Limpiar y normalizar el CSV
+        if is_static:
+            clean_data_csv(original_csv, modified_csv, is_static, cal_limits)
+        else:
+            clean_dynamic_data(original_csv, modified_csv, cal_limits, raise_errors=True)
+        if not os.path.exists(modified_csv):
+            raise RuntimeError("la limpieza no generó el CSV modificado")
+
+        # Copia opcional del archivo limpio en otro formato, con las mismas columnas y tipos
+        if extra_output is not None:
+            export_frame(_read_cleaned_csv(modified_csv), extra_output, export_format)
+
+        result.update(estado='ok', salida=modified_csv)
+
+    except Exception as e:
+        _remove_files(outputs)
+        result.update(estado='error', error=f"{type(e).__name__}: {e}")
+
+    result['segundos'] = round(time.perf_counter() - start, 3)
+    return result
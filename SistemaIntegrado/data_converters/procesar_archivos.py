@@ -11,8 +11,12 @@ import numpy as np
 import os
 import re
 
+from data_converters.calidad_datos import (
+    analyze_data_quality, write_quality_summary, quality_summary_path
+)
 
-def clean_data_csv(input_filepath, output_filepath, is_static):
+
+def clean_data_csv(input_filepath, output_filepath, is_static, cal_limits=None):
     """
     Limpia archivos CSV de datos estáticos (galgas extensiométricas, LVDT)
     
@@ -21,11 +25,13 @@ def clean_data_csv(input_filepath, output_filepath, is_static):
     2. Normaliza la columna RECORD como índice numérico
     3. Procesa timestamps a formato estándar
     4. Convierte columnas numéricas y limpia valores NaN
+    5. Guarda un resumen de calidad (_calidad.json) junto al archivo limpio
     
     Args:
         input_filepath: Ruta del archivo CSV original
         output_filepath: Ruta donde guardar el archivo limpio
         is_static: True para datos estáticos, False para dinámicos
+        cal_limits: Límites de calibración {sensor: (inferior, superior)}
     """
     try:
         # Detectar separador del CSV
@@ -37,6 +43,14 @@ def clean_data_csv(input_filepath, output_filepath, is_static):
         # Leer archivo con el separador correcto
         df = pd.read_csv(input_filepath, sep=separator, na_values=['NAN', ''], encoding='utf-8')
         
+        # Contar RECORD inválidos antes de que la normalización los descarte
+        # (columna RECORD) o los reemplace por 0 (columna de nombre similar)
+        invalid_records = 0
+        record_col = 'RECORD' if 'RECORD' in df.columns else \
+            next((col for col in df.columns if 'record' in col.lower()), None)
+        if record_col is not None:
+            invalid_records = int(pd.to_numeric(df[record_col], errors='coerce').isna().sum())
+        
         # Normalizar columna RECORD (índice de muestra)
         df = _normalize_record_column(df)
         
@@ -49,10 +63,25 @@ def clean_data_csv(input_filepath, output_filepath, is_static):
                        if col not in ['RECORD', 'TIMESTAMP'] 
                        and df[col].dtype in ['float64', 'int64', 'object']]
         
-        # Convertir columnas a numéricas y limpiar NaN
+        # Convertir columnas a numéricas registrando los valores no convertibles
+        coerced = {}
         for col in data_columns:
             if df[col].dtype == 'object':
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+                numeric = pd.to_numeric(df[col], errors='coerce')
+                lost = int((numeric.isna() & df[col].notna()).sum())
+                if lost:
+                    coerced[col] = lost
+                df[col] = numeric
+        
+        # Resumen de calidad sobre los datos numéricos
+        summary = analyze_data_quality(df, cal_limits, extra={
+            'record_invalidos': invalid_records,
+            'valores_no_numericos': coerced,
+        })
+        write_quality_summary(summary, quality_summary_path(output_filepath))
+        
+        # Limpiar NaN
+        for col in data_columns:
             df[col] = df[col].replace({np.nan: '', pd.NA: ''})
         
         # Eliminar filas completamente vacías
@@ -100,7 +129,7 @@ def _normalize_record_column(df):
     return df
 
 
-def clean_dynamic_data(input_filepath, output_filepath):
+def clean_dynamic_data(input_filepath, output_filepath, cal_limits=None, raise_errors=False):
     """
     Limpia archivos CSV de datos dinámicos (convertidos de TDMS)
     
@@ -108,10 +137,13 @@ def clean_dynamic_data(input_filepath, output_filepath):
     1. Renombra columnas largas a nombres cortos (A2120, LV6195, etc.)
     2. Elimina canales no utilizados (CHAN-1, CHAN-2, etc.)
     3. Convierte 'Time' a 'RECORD' como índice
+    4. Guarda un resumen de calidad (_calidad.json) junto al archivo limpio
     
     Args:
         input_filepath: Ruta del archivo CSV original de TDMS
         output_filepath: Ruta donde guardar el archivo limpio
+        cal_limits: Límites de calibración {sensor: (inferior, superior)}
+        raise_errors: Propaga el error en lugar de solo mostrarlo
     """
     try:
         df = pd.read_csv(input_filepath)
@@ -145,6 +177,10 @@ def clean_dynamic_data(input_filepath, output_filepath):
         
         df = df[columns_to_keep]
         
+        # Resumen de calidad sobre los datos numéricos
+        summary = analyze_data_quality(df, cal_limits)
+        write_quality_summary(summary, quality_summary_path(output_filepath))
+        
         # Limpiar valores NaN
         df = df.replace({np.nan: ''})
         
@@ -154,4 +190,6 @@ def clean_dynamic_data(input_filepath, output_filepath):
         print(f"✓ Archivo dinámico procesado: '{output_filepath}'")
         
     except Exception as e:
-        print(f"✗ Error al limpiar archivo dinámico {input_filepath}: {e}")
\ No newline at end of file
+        print(f"✗ Error al limpiar archivo dinámico {input_filepath}: {e}")
+        if raise_errors:
+            raise
\ No newline at end of file
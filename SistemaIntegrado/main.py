@@ -1,60 +1,322 @@
+"""
+Procesamiento por lotes sin interfaz gráfica
+Convierte y limpia campañas completas con el mismo flujo que el dashboard
+(data_converters.pipeline) y exporta selecciones de archivos procesados
+"""
+
 import os
-import shutil
-from data_converters.convert_dat2csv import convert_dat_to_csv
-from data_converters.convert_tdms2csv import convert_tdms_to_csv
-from data_converters.procesar_archivos import clean_data_csv
+import sys
+import glob
+import json
+import hashlib
+import time
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from data_converters.pipeline import (
+    process_file, output_paths, extra_output_path, STATIC_SUBDIR, DYNAMIC_SUBDIR, SUPPORTED_EXTENSIONS
+)
+from data_converters.calidad_datos import load_cal_limits_from_dir
+from data_converters.exportar_datos import export_selection, with_export_extension, EXPORT_FORMATS
+
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _find_input_files(input_root, pattern, output_root):
+    """
+    Busca los archivos soportados que coinciden con el patrón (glob recursivo)
+
+    Se excluye la carpeta de salida, para no tomar como entradas los CSV
+    generados en ejecuciones anteriores cuando está dentro de la entrada.
+
+    Returns:
+        Lista ordenada de rutas relativas a input_root
+    """
+    output_root = os.path.abspath(output_root)
+    matches = glob.glob(os.path.join(input_root, pattern), recursive=True)
+    return sorted(
+        os.path.relpath(path, input_root) for path in matches
+        if os.path.isfile(path)
+        and path.endswith(SUPPORTED_EXTENSIONS)
+        and not os.path.basename(path).startswith('.')
+        and os.path.commonpath([os.path.abspath(path), output_root]) != output_root
+    )
+
+
+def _output_collisions(relative_paths, static_dir, dynamic_dir):
+    """
+    Archivos de entrada que generarían la misma salida (p. ej. run.dat y run.csv
+    en la misma carpeta)
+
+    Returns:
+        dict: {ruta_relativa: otras rutas relativas con la misma salida}
+    """
+    by_output = {}
+    for relative_path in relative_paths:
+        paths = output_paths(relative_path, static_dir, dynamic_dir, os.path.dirname(relative_path))
+        by_output.setdefault(paths, []).append(relative_path)
+
+    return {
+        relative_path: [other for other in group if other != relative_path]
+        for group in by_output.values() if len(group) > 1
+        for relative_path in group
+    }
+
+
+def _cal_limits_by_dir(input_root, relative_paths):
+    """
+    Límites de calibración para cada subcarpeta de entrada
+
+    Los archivos .cal de la raíz aplican a toda la campaña y los de cada
+    subcarpeta se agregan (o reemplazan) para los archivos de esa carpeta.
+
+    Returns:
+        dict: {subcarpeta_relativa: límites}
+    """
+    root_limits = load_cal_limits_from_dir(input_root)
+    limits = {}
+    for relative_dir in {os.path.dirname(path) for path in relative_paths}:
+        limits[relative_dir] = dict(root_limits)
+        if relative_dir:
+            limits[relative_dir].update(load_cal_limits_from_dir(os.path.join(input_root, relative_dir)))
+    return limits
+
+
+def _load_manifest(manifest_path):
+    """Lee el manifiesto de una ejecución anterior (vacío si no existe o está dañado)"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(manifest, manifest_path):
+    """Guarda el manifiesto de forma atómica para poder reanudar tras una interrupción"""
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def _cal_hash(cal_limits):
+    """Huella de los límites de calibración, para reprocesar si cambia el .cal"""
+    text = json.dumps(sorted(cal_limits.items()), ensure_ascii=False)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _file_signature(path, export_format, cal_limits):
+    """
+    Datos que deben coincidir para considerar un archivo ya procesado:
+    tamaño y fecha de modificación de la entrada, formato adicional y calibración
+    """
+    stat = os.stat(path)
+    return {'tamano': stat.st_size, 'mtime': stat.st_mtime,
+            'formato': export_format, 'cal': _cal_hash(cal_limits)}
+
+
+def _is_done(entry, signature):
+    """Indica si el manifiesto registra el archivo como procesado sin cambios"""
+    if entry is None or entry.get('estado') != 'ok' or entry.get('salida') is None:
+        return False
+    if any(entry.get(key) != value for key, value in signature.items()):
+        return False
 
-def main():
+    outputs = [entry['salida'], extra_output_path(entry['salida'], signature['formato'])]
+    return all(os.path.exists(path) for path in outputs if path is not None)
+
+
+def _process_task(input_path, static_dir, dynamic_dir, cal_limits,
+                  relative_dir, export_format, quiet):
+    """Ejecuta process_file en un proceso trabajador, opcionalmente sin mensajes"""
+    if not quiet:
+        return process_file(input_path, static_dir, dynamic_dir, cal_limits,
+                            relative_dir, export_format)
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return process_file(input_path, static_dir, dynamic_dir, cal_limits,
+                            relative_dir, export_format)
+
+
+def main(args):
     """
-    Flujo de trabajo principal para la conversión y clasificación de datos
+    Flujo de trabajo principal para la conversión, clasificación y limpieza de datos
+
+    Returns:
+        Código de salida: 0 si todo se procesó, 1 si algún archivo falló,
+        2 si la carpeta de entrada no existe
     """
     # 1. Definir directorios
-    data_dir = "datos"
-    processed_dir = "archivos_procesados"
-    static_dir = os.path.join(processed_dir, "Pruebas_Estaticas")
-    dynamic_dir = os.path.join(processed_dir, "Pruebas_Dinamicas")
-
-    # Crear directorios si no existen
-    for d in [processed_dir, static_dir, dynamic_dir]:
-        if not os.path.exists(d):
-            os.makedirs(d)
-
-    if not os.path.exists(processed_dir):
-        os.makedirs(processed_dir)
-
-        # 2. Iterar, convertir, clasificar y limpiar
-    for filename in os.listdir(data_dir):
-        input_filepath = os.path.join(data_dir, filename)
-        base_name = os.path.splitext(filename)[0]
-        
-        # Determinar el directorio de destino
-        if filename.endswith(('.dat', '.csv')): # Campbell (.dat) y ESP32 (.csv) son estáticas
-            target_dir = static_dir
-            is_static = True
-        elif filename.endswith('.tdms'): # BDI (.tdms) son dinámicas
-            target_dir = dynamic_dir
-            is_static = False
+    if not os.path.isdir(args.entrada):
+        print(f"✗ Carpeta de entrada no encontrada: {args.entrada}")
+        return 2
+
+    static_dir = os.path.join(args.salida, STATIC_SUBDIR)
+    dynamic_dir = os.path.join(args.salida, DYNAMIC_SUBDIR)
+    for d in [args.salida, static_dir, dynamic_dir]:
+        os.makedirs(d, exist_ok=True)
+
+    # El manifiesto se conserva siempre: una ejecución parcial (otro --patron)
+    # actualiza solo sus archivos; --reanudar decide si se omiten los ya procesados
+    manifest_path = os.path.join(args.salida, MANIFEST_NAME)
+    manifest = _load_manifest(manifest_path)
+
+    # 2. Seleccionar archivos pendientes
+    relative_paths = _find_input_files(args.entrada, args.patron, args.salida)
+    cal_limits = _cal_limits_by_dir(args.entrada, relative_paths)
+    collisions = _output_collisions(relative_paths, static_dir, dynamic_dir)
+
+    pending, results = [], []
+    for relative_path in relative_paths:
+        input_path = os.path.join(args.entrada, relative_path)
+        signature = _file_signature(input_path, args.formato,
+                                    cal_limits[os.path.dirname(relative_path)])
+        if relative_path in collisions:
+            # Ninguno de los archivos en conflicto se procesa: se sobrescribirían entre sí
+            error = f"misma salida que {', '.join(collisions[relative_path])}"
+            results.append({'archivo': input_path, 'estado': 'error', 'salida': None, 'error': error})
+            manifest[relative_path] = {**signature, 'estado': 'error', 'salida': None, 'error': error}
+            print(f"✗ {relative_path}: {error}")
+        elif args.reanudar and _is_done(manifest.get(relative_path), signature):
+            results.append({'archivo': input_path, 'estado': 'reanudado',
+                            'salida': manifest[relative_path]['salida'], 'error': None})
         else:
-            continue # Ignorar otros formatos
-
-        # Rutas de archivo
-        original_csv_path = os.path.join(target_dir, f"{base_name}_original.csv")
-        modified_csv_path = os.path.join(target_dir, f"{base_name}_modificado.csv")
-        
-        # A. Conversión / Copia a CSV original
-        if filename.endswith('.dat'):
-            convert_dat_to_csv(input_filepath, original_csv_path)
-        elif filename.endswith('.tdms'):
-            convert_tdms_to_csv(input_filepath, original_csv_path)
-        elif filename.endswith('.csv'): # Archivos del ESP32
-            shutil.copy(input_filepath, original_csv_path)
-            print(f"✅ Archivo '{filename}' copiado a original.")
-
-        # B. Limpieza de datos (solo si se creó el original)
-        if os.path.exists(original_csv_path):
-            clean_data_csv(original_csv_path, modified_csv_path, is_static)
-        
-    print("\nProceso de conversión, clasificación y limpieza inicial completado.")
+            pending.append((relative_path, input_path, signature))
+
+    print(f"Archivos encontrados: {len(relative_paths)} | "
+          f"pendientes: {len(pending)} | ya procesados: {len(results)}")
+
+    # 3. Convertir, clasificar y limpiar en paralelo
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(_process_task, input_path, static_dir, dynamic_dir,
+                            cal_limits[os.path.dirname(relative_path)],
+                            os.path.dirname(relative_path), args.formato, args.silencioso):
+                (relative_path, signature)
+            for relative_path, input_path, signature in pending
+        }
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            relative_path, signature = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'archivo': os.path.join(args.entrada, relative_path),
+                          'estado': 'error', 'salida': None, 'error': str(e)}
+            results.append(result)
+
+            manifest[relative_path] = {**signature, 'estado': result['estado'],
+                                       'salida': result['salida'], 'error': result['error']}
+            _save_manifest(manifest, manifest_path)
+
+            icon = {'ok': '✓', 'error': '✗'}.get(result['estado'], '-')
+            detail = f": {result['error']}" if result['error'] else ''
+            print(f"[{done}/{len(pending)}] {icon} {relative_path}{detail}")
+
+    # 4. Resumen
+    totals = {}
+    for result in results:
+        totals[result['estado']] = totals.get(result['estado'], 0) + 1
+
+    summary = {
+        'entrada': os.path.abspath(args.entrada),
+        'salida': os.path.abspath(args.salida),
+        'workers': args.workers,
+        'formato': args.formato,
+        'duracion_segundos': round(time.perf_counter() - start, 3),
+        'totales': totals,
+        'archivos': sorted(results, key=lambda r: r['archivo']),
+    }
+    if args.resumen:
+        os.makedirs(os.path.dirname(os.path.abspath(args.resumen)), exist_ok=True)
+        with open(args.resumen, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    print(f"\nProceso de conversión, clasificación y limpieza completado: {totals} "
+          f"en {summary['duracion_segundos']} s")
+
+    return 1 if totals.get('error') else 0
+
+
+def exportar(args):
+    """
+    Exporta por bloques una selección de archivos procesados, equivalente
+    a la exportación del dashboard
+    """
+    record_range = None
+    if args.desde is not None or args.hasta is not None:
+        record_range = (
+            args.desde if args.desde is not None else float('-inf'),
+            args.hasta if args.hasta is not None else float('inf'),
+        )
+
+    output_path = with_export_extension(args.salida, args.formato)
+    if output_path != args.salida:
+        print(f"Archivo de salida: '{output_path}' (extensión del formato {args.formato})")
+
+    try:
+        export_selection(args.archivos, output_path, args.formato,
+                         sensors=args.sensores, record_range=record_range)
+    except Exception as e:
+        print(f"✗ Error al exportar: {e}")
+        return 1
+    return 0
+
+
+def parse_args(argv=None):
+    """
+    Define los argumentos de la línea de comandos
+
+    Sin subcomando se ejecuta 'procesar' con los valores por defecto
+    (datos/ -> archivos_procesados/), igual que el botón del dashboard.
+    """
+    parser = argparse.ArgumentParser(
+        description="Conversión, limpieza y exportación de datos de monitoreo estructural"
+    )
+    subparsers = parser.add_subparsers(dest='comando')
+
+    process_parser = subparsers.add_parser(
+        'procesar', help="Convierte y limpia los archivos .dat, .tdms y .csv de una campaña"
+    )
+    process_parser.add_argument('-i', '--entrada', default="datos", help="Carpeta raíz de entrada")
+    process_parser.add_argument('-o', '--salida', default="archivos_procesados",
+                                help="Carpeta raíz de salida")
+    process_parser.add_argument('-p', '--patron', default="**/*",
+                                help="Patrón glob recursivo relativo a la entrada (por defecto '**/*')")
+    process_parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                                help="Procesos en paralelo (por defecto, uno por CPU)")
+    process_parser.add_argument('-f', '--formato', choices=['csv', 'parquet', 'tdms'], default='csv',
+                                help="Formato adicional del archivo limpio (el CSV se genera siempre)")
+    process_parser.add_argument('-r', '--reanudar', action='store_true',
+                                help="Omite los archivos sin cambios procesados según el manifiesto")
+    process_parser.add_argument('--resumen', help="Ruta del resumen JSON de la ejecución")
+    process_parser.add_argument('-q', '--silencioso', action='store_true',
+                                help="Oculta los mensajes de cada paso de conversión")
+
+    export_parser = subparsers.add_parser(
+        'exportar', help="Exporta archivos _modificado.csv filtrados por sensores y RECORD"
+    )
+    export_parser.add_argument('archivos', nargs='+', help="Archivos _modificado.csv a exportar")
+    export_parser.add_argument('-o', '--salida', required=True,
+                               help="Archivo de salida (se ajusta a la extensión del formato)")
+    export_parser.add_argument('-f', '--formato', choices=list(EXPORT_FORMATS), default='parquet')
+    export_parser.add_argument('-s', '--sensores', nargs='+', help="Sensores a exportar (por defecto todos)")
+    export_parser.add_argument('--desde', type=float, help="RECORD mínimo")
+    export_parser.add_argument('--hasta', type=float, help="RECORD máximo")
+
+    args = parser.parse_args(argv)
+    if args.comando is None:
+        args = parser.parse_args(['procesar'])
+    if args.comando == 'procesar' and args.workers < 1:
+        parser.error("--workers debe ser al menos 1")
+    return args
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    if args.comando == 'exportar':
+        sys.exit(exportar(args))
+    sys.exit(main(args))